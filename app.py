@@ -8,7 +8,7 @@ import feedparser
 from bs4 import BeautifulSoup
 
 
-from auth import login, signup
+from auth import login, signup, validate_session
 from scraper import scrape_articles
 from summarizer import summarize_articles
 from analyzer import analyze_keywords
@@ -27,6 +27,7 @@ st.set_page_config(
 # -------------------------------
 # Authentication / Guest Access
 # -------------------------------
+validate_session()
 if "user" not in st.session_state:
     st.sidebar.title("Authentication")
     choice = st.sidebar.selectbox("Choose:", ["Login", "Sign Up", "Continue as Guest"])
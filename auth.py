@@ -1,65 +1,82 @@
-import os
 import streamlit as st
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
-from supabase_client import init_connection
+from auth_backend import get_auth_backend, session_is_valid
 
 # Load .env for local development
 load_dotenv()
 
-# Initialize Supabase connection
-supabase = init_connection()
-
 # -----------------------------------
-# Lazy Supabase Client
+# Lazy Auth Backend
 # -----------------------------------
-@st.cache_resource
-def supabase_client() -> Client:
-    """Initialize Supabase client using secrets or .env"""
-    url = os.getenv("SUPABASE_URL") or st.secrets.get("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY") or st.secrets.get("SUPABASE_KEY")
-
-    if not url or not key:
-        st.error("❌ Supabase credentials missing. Set them in `.env` locally or Streamlit Secrets in deployed app.")
+def auth_backend():
+    """Shared auth backend (one Supabase client per process)."""
+    try:
+        return get_auth_backend()
+    except Exception as e:
+        st.error(f"❌ Auth backend unavailable: {e}. Set Supabase credentials in `.env` locally or Streamlit Secrets in deployed app.")
         st.stop()
 
-    return create_client(url, key)
+def _store_session(session):
+    st.session_state["user"] = {
+        "email": session.email,
+        "id": session.user_id,
+        "guest": False,
+        "access_token": session.access_token,
+        "refresh_token": session.refresh_token,
+        "expires_at": session.expires_at,
+    }
 
 # -----------------------------------
 # Authentication
 # -----------------------------------
 def login():
-    supabase = supabase_client()
     st.subheader("🔐 Login to Your Account")
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
 
     if st.button("Login"):
         try:
-            result = supabase.auth.sign_in_with_password({"email": email, "password": password})
-            st.session_state["user"] = {"email": result.user.email, "id": result.user.id}
-            st.success(f"Welcome back, {result.user.email}!")
+            session = auth_backend().sign_in(email, password)
+            _store_session(session)
+            st.success(f"Welcome back, {session.email}!")
             st.experimental_rerun()
         except Exception as e:
             st.error(f"Login failed: {e}")
 
 def signup():
-    supabase = supabase_client()
     st.subheader("🧾 Create an Account")
     email = st.text_input("Email", key="signup_email")
     password = st.text_input("Password", type="password", key="signup_password")
 
     if st.button("Sign Up"):
         try:
-            supabase.auth.sign_up({"email": email, "password": password})
-            st.session_state["user"] = {"email": email, "guest": False}
+            session = auth_backend().sign_up(email, password)
+            _store_session(session)
             st.success("✅ Account created! Check your email for verification.")
             st.experimental_rerun()
         except Exception as e:
             st.error(f"Signup failed: {e}")
 
+def validate_session():
+    """
+    Check the signed-in user's token locally on each rerun and only call the
+    auth API to refresh it once it is about to expire. Logs out if refresh fails.
+    The session lives only in this browser's session state, so each refresh token
+    is used (and replaced) by exactly one session and Logout drops it.
+    """
+    user = st.session_state.get("user")
+    if not user or user.get("guest") or not user.get("refresh_token"):
+        return
+    if session_is_valid(user):
+        return
+
+    try:
+        _store_session(auth_backend().refresh(user["refresh_token"]))
+    except Exception:
+        st.session_state.pop("user", None)
+        st.warning("Your session expired. Please log in again.")
+
 def guest_access():
     """Set guest user in session."""
     st.session_state["user"] = {"guest": True}
-
@@ -0,0 +1,88 @@
+# auth_backend.py
+import os
+import time
+import threading
+import importlib
+from collections import namedtuple
+
+from supabase_client import init_connection
+
+# How long to trust a session when the backend doesn't report an expiry
+DEFAULT_SESSION_TTL = 3600
+# Refresh this many seconds before the token actually expires
+EXPIRY_MARGIN = 60
+
+AuthSession = namedtuple(
+    "AuthSession", ["user_id", "email", "access_token", "refresh_token", "expires_at"]
+)
+
+def session_is_valid(session, now=None):
+    """
+    True while the session's token is still usable (with a safety margin).
+    Used to skip auth round-trips on reruns; it never stands in for a login.
+    """
+    if not session or not session.get("expires_at"):
+        return False
+    return (now or time.time()) < session["expires_at"] - EXPIRY_MARGIN
+
+# -----------------------------------
+# Supabase Backend
+# -----------------------------------
+class SupabaseAuthBackend:
+    """Default backend: talks to Supabase Auth through the shared client."""
+
+    def __init__(self, client=None):
+        self.client = client or init_connection()
+        if self.client is None:
+            raise RuntimeError("Supabase credentials missing or invalid")
+
+    @staticmethod
+    def _to_session(result, email=None):
+        session = getattr(result, "session", None)
+        user = getattr(result, "user", None) or getattr(session, "user", None)
+        expires_at = getattr(session, "expires_at", None)
+        if session is not None and not expires_at:
+            expires_at = time.time() + DEFAULT_SESSION_TTL
+        return AuthSession(
+            user_id=getattr(user, "id", None),
+            email=getattr(user, "email", None) or email,
+            access_token=getattr(session, "access_token", None),
+            refresh_token=getattr(session, "refresh_token", None),
+            expires_at=expires_at,
+        )
+
+    def sign_in(self, email, password):
+        result = self.client.auth.sign_in_with_password({"email": email, "password": password})
+        return self._to_session(result, email)
+
+    def sign_up(self, email, password):
+        result = self.client.auth.sign_up({"email": email, "password": password})
+        return self._to_session(result, email)
+
+    def refresh(self, refresh_token):
+        result = self.client.auth.refresh_session(refresh_token)
+        return self._to_session(result)
+
+# -----------------------------------
+# Backend Selection
+# -----------------------------------
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_auth_backend():
+    """
+    Return the process-wide auth backend.
+    Set AUTH_BACKEND="module:factory" to plug in another implementation (e.g. one that
+    targets a local stand-in auth server for load tests); the factory is called with no
+    arguments and must return an object with sign_in, sign_up and refresh.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            spec = os.getenv("AUTH_BACKEND")
+            if spec:
+                module_name, _, factory = spec.partition(":")
+                _backend = getattr(importlib.import_module(module_name), factory or "create_backend")()
+            else:
+                _backend = SupabaseAuthBackend()
+        return _backend
@@ -0,0 +1,111 @@
+# checkpoint.py
+import os
+import glob
+import gzip
+import json
+import time
+
+STAGES = ("scrape", "summarize", "keywords")
+MANIFEST_FILE = "checkpoint.json"
+# Older unfinished runs are abandoned so a daily job doesn't keep resuming stale data
+RESUME_MAX_AGE_HOURS = 6
+# A run that keeps crashing at the same point is given up on after this many resumes
+MAX_RESUME_ATTEMPTS = 3
+
+# -----------------------------------------
+# Paths
+# -----------------------------------------
+def _stage_path(run_dir, stage):
+    return os.path.join(run_dir, f"{stage}.json.gz")
+
+def _manifest_path(run_dir):
+    return os.path.join(run_dir, MANIFEST_FILE)
+
+def _write_atomic(path, data, compress=False):
+    """Write to a temp file first so a crash never leaves a half-written checkpoint."""
+    tmp_path = f"{path}.tmp"
+    opener = gzip.open if compress else open
+    with opener(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+# -----------------------------------------
+# Run Manifest
+# -----------------------------------------
+def load_manifest(run_dir):
+    try:
+        with open(_manifest_path(run_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def start_run(run_dir, topic):
+    """Create the manifest for a fresh run directory."""
+    os.makedirs(run_dir, exist_ok=True)
+    manifest = {
+        "topic": topic,
+        "stages": [],
+        "complete": False,
+        "started_at": time.time(),
+        "attempts": 1,
+    }
+    _write_atomic(_manifest_path(run_dir), manifest)
+    return manifest
+
+def mark_complete(run_dir):
+    manifest = load_manifest(run_dir) or {"stages": []}
+    manifest["complete"] = True
+    _write_atomic(_manifest_path(run_dir), manifest)
+
+def find_resumable_run(topic, base_dir="data", max_age_hours=RESUME_MAX_AGE_HOURS,
+                       max_attempts=MAX_RESUME_ATTEMPTS):
+    """
+    Return the newest unfinished run directory for the topic, or None.
+    Only recent runs that haven't used up their attempts qualify; the returned
+    run's attempt counter is bumped.
+    """
+    cutoff = time.time() - max_age_hours * 3600
+    for run_dir in sorted(glob.glob(os.path.join(base_dir, "run_*")), reverse=True):
+        manifest = load_manifest(run_dir)
+        if not manifest or manifest.get("topic") != topic or manifest.get("complete"):
+            continue
+        # Only the newest unfinished run is considered; if it is stale or keeps
+        # crashing, start fresh rather than falling back to an even older one
+        if manifest.get("started_at", 0) < cutoff or manifest.get("attempts", 1) >= max_attempts:
+            return None
+        manifest["attempts"] = manifest.get("attempts", 1) + 1
+        _write_atomic(_manifest_path(run_dir), manifest)
+        return run_dir
+    return None
+
+# -----------------------------------------
+# Stage Checkpoints
+# -----------------------------------------
+def save_stage(run_dir, stage, data):
+    """Persist a stage's output as gzipped JSON and record it in the manifest."""
+    _write_atomic(_stage_path(run_dir, stage), data, compress=True)
+
+    manifest = load_manifest(run_dir) or {"stages": [], "complete": False}
+    if stage not in manifest["stages"]:
+        manifest["stages"].append(stage)
+    _write_atomic(_manifest_path(run_dir), manifest)
+
+def load_stage(run_dir, stage):
+    """Return a stage's saved output, or None if it never finished or is unreadable."""
+    manifest = load_manifest(run_dir)
+    if not manifest or stage not in manifest.get("stages", []):
+        return None
+    try:
+        with gzip.open(_stage_path(run_dir, stage), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError, EOFError):
+        return None
+
+def invalidate_after(run_dir, stage):
+    """Drop every stage that follows `stage` so it is recomputed from fresh input."""
+    manifest = load_manifest(run_dir)
+    if not manifest:
+        return
+    later = STAGES[STAGES.index(stage) + 1:]
+    manifest["stages"] = [s for s in manifest["stages"] if s not in later]
+    _write_atomic(_manifest_path(run_dir), manifest)
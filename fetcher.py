@@ -0,0 +1,418 @@
+# fetcher.py
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+# Transient transport errors worth retrying; any other RequestException fails immediately
+RETRYABLE_ERRORS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+MAX_REDIRECTS = 5
+
+class FetchError(Exception):
+    """Raised when a URL could not be fetched after all retries."""
+
+class CircuitOpenError(FetchError):
+    """Raised when a host's circuit breaker is open and the request was not attempted."""
+
+class FetchResult:
+    """A response whose body (possibly size-capped) has already been read and the connection released."""
+
+    def __init__(self, response, content):
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.encoding = response.encoding
+        self.is_redirect = response.is_redirect
+        self.content = content
+
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding or "utf-8", errors="ignore")
+        except LookupError:
+            # Bogus charset in the Content-Type header (e.g. "utf8mb4")
+            return self.content.decode("utf-8", errors="ignore")
+
+def _read_body(response, max_bytes=None):
+    """Read the streamed body, stopping after max_bytes so huge pages can't exhaust memory."""
+    chunks, size = [], 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if max_bytes is not None and size >= max_bytes:
+            break
+    body = b"".join(chunks)
+    return body[:max_bytes] if max_bytes is not None else body
+
+# -----------------------------------------
+# Rate Limiting
+# -----------------------------------------
+class TokenBucket:
+    """Thread-safe token bucket. `reserve()` takes a token and returns how long to wait for it."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+# -----------------------------------------
+# Circuit Breaking
+# -----------------------------------------
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; allows one trial after `reset_timeout`."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+# -----------------------------------------
+# Per-host Statistics
+# -----------------------------------------
+class HostStats:
+    """Counters are shared by the fetch threads, so all updates go through the lock."""
+
+    def __init__(self, window=100):
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def add_latency(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def as_dict(self):
+        with self._lock:
+            return self._as_dict()
+
+    def _as_dict(self):
+        latencies = sorted(self.latencies)
+        avg = sum(latencies) / len(latencies) if latencies else 0.0
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "error_rate": round(self.errors / self.requests, 3) if self.requests else 0.0,
+            "avg_latency_ms": round(avg * 1000, 1),
+            "p95_latency_ms": round(p95 * 1000, 1),
+        }
+
+class _HostState:
+    def __init__(self, scheduler):
+        self.bucket = TokenBucket(scheduler.rate, scheduler.burst, scheduler._clock)
+        self.breaker = CircuitBreaker(scheduler.failure_threshold, scheduler.reset_timeout, scheduler._clock)
+        self.stats = HostStats()
+        self.limit = 1.0
+        self.active = 0
+        self.cond = threading.Condition()
+
+# -----------------------------------------
+# Fetch Scheduler
+# -----------------------------------------
+class FetchScheduler:
+    """
+    Polite HTTP fetcher shared by all scraping calls.
+    Each host gets its own token bucket, circuit breaker and an AIMD concurrency limit
+    that grows on success and halves (along with the request rate) when the host throttles us.
+    Redirects are followed one hop at a time so each hop is limited and tracked under the
+    host that actually serves it (e.g. the publisher behind a news.google.com link).
+    `session`, `clock`, `sleep` and `rng` can be swapped out to run against a local stub server.
+    """
+
+    def __init__(self, rate=2.0, burst=4, max_concurrency=4, max_retries=3,
+                 backoff_base=0.5, backoff_max=30.0, failure_threshold=5,
+                 reset_timeout=60.0, timeout=5, session=None,
+                 clock=time.monotonic, sleep=time.sleep, rng=None):
+        self.rate = rate
+        self.min_rate = rate / 16
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(self)
+            return self._hosts[host]
+
+    @contextmanager
+    def _slot(self, state):
+        with state.cond:
+            while state.active >= int(state.limit):
+                state.cond.wait()
+            state.active += 1
+        try:
+            yield
+        finally:
+            with state.cond:
+                state.active -= 1
+                state.cond.notify_all()
+
+    def _on_success(self, state):
+        with state.cond:
+            state.limit = min(self.max_concurrency, state.limit + 1 / state.limit)
+            state.cond.notify_all()
+        state.bucket.set_rate(min(self.rate, state.bucket.rate + self.rate / 10))
+
+    def _on_throttle(self, state):
+        with state.cond:
+            state.limit = max(1.0, state.limit / 2)
+        state.bucket.set_rate(max(self.min_rate, state.bucket.rate / 2))
+
+    def _backoff(self, attempt, retry_after=None):
+        """
+        Exponential backoff with full jitter, never shorter than the server's Retry-After.
+        Returns None when Retry-After exceeds backoff_max, meaning the request should not be retried.
+        """
+        if retry_after is not None and retry_after > self.backoff_max:
+            return None
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def fetch(self, url, max_bytes=None, group=None):
+        """
+        GET a URL, retrying timeouts, connection errors, 429s and 5xx. Raises FetchError on failure.
+        Returns a FetchResult whose body was read inside the retry loop, truncated to max_bytes if given.
+        `group` keeps requests on their own limiter and breaker (e.g. "feed"), separate from
+        other traffic to the same host.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._fetch_hop(url, max_bytes, group)
+            if not response.is_redirect:
+                return response
+            try:
+                url = urljoin(url, response.headers["Location"])
+            except ValueError as e:
+                raise FetchError(f"Bad redirect from {url}: {e}") from e
+        raise FetchError(f"Too many redirects for {url}")
+
+    def _fetch_hop(self, url, max_bytes, group):
+        """Fetch a single hop (no redirect following) under the limits of its own host."""
+        try:
+            host = urlparse(url).netloc.lower()
+        except ValueError as e:
+            raise FetchError(f"Invalid URL {url}: {e}") from e
+        state = self._host(f"{group}:{host}" if group else host)
+
+        if not state.breaker.allow():
+            state.stats.add(rejected=1)
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        with self._slot(state):
+            error = None
+            for attempt in range(self.max_retries + 1):
+                wait = state.bucket.reserve()
+                if wait:
+                    self._sleep(wait)
+
+                retry_after = None
+                state.stats.add(requests=1)
+                start = self._clock()
+                try:
+                    response = self._get(url, max_bytes)
+                except RETRYABLE_ERRORS as e:
+                    state.stats.add(errors=1)
+                    error = e
+                except Exception as e:
+                    # Bad URL, invalid redirect target, etc. — retrying won't help
+                    state.stats.add(errors=1)
+                    state.breaker.record_failure()
+                    raise FetchError(f"Could not request {url}: {e}") from e
+                else:
+                    state.stats.add_latency(self._clock() - start)
+                    if response.status_code < 400:
+                        state.stats.add(successes=1)
+                        state.breaker.record_success()
+                        self._on_success(state)
+                        return response
+
+                    state.stats.add(errors=1)
+                    if response.status_code not in RETRYABLE_STATUS:
+                        # The host answered, so it is healthy even if this page is missing
+                        state.breaker.record_success()
+                        raise FetchError(f"HTTP {response.status_code} for {url}")
+
+                    error = FetchError(f"HTTP {response.status_code} for {url}")
+                    retry_after = self._retry_after(response)
+                    if response.status_code in THROTTLE_STATUS:
+                        self._on_throttle(state)
+
+                state.breaker.record_failure()
+
+                if attempt == self.max_retries or not state.breaker.allow():
+                    break
+                delay = self._backoff(attempt, retry_after)
+                if delay is None:
+                    break
+                state.stats.add(retries=1)
+                self._sleep(delay)
+
+        raise FetchError(f"Giving up on {url}: {error}") from error
+
+    def _get(self, url, max_bytes):
+        """One GET with the body read before returning, so body timeouts count as fetch failures."""
+        response = self.session.get(url, timeout=self.timeout, stream=True, allow_redirects=False)
+        try:
+            ok = response.status_code < 400 and not response.is_redirect
+            return FetchResult(response, _read_body(response, max_bytes) if ok else b"")
+        finally:
+            response.close()
+
+    def stats(self):
+        """Per-host latency, error and limiter stats."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        report = {}
+        for host, state in hosts.items():
+            report[host] = state.stats.as_dict()
+            report[host].update({
+                "concurrency_limit": int(state.limit),
+                "rate_per_sec": round(state.bucket.rate, 3),
+                "circuit": state.breaker.state,
+            })
+        return report
+
+    def export_stats(self, path, merge=False):
+        """
+        Write stats() as JSON. With merge=True, counters already in the file are added to
+        the current ones (averages weighted by request count; other fields take the newest value).
+        """
+        report = self.stats()
+        if merge:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = {}
+            for host, old in previous.items():
+                new = report.get(host)
+                if new is None:
+                    report[host] = old
+                    continue
+                total = old.get("requests", 0) + new["requests"]
+                if total:
+                    new["avg_latency_ms"] = round(
+                        (old.get("avg_latency_ms", 0.0) * old.get("requests", 0)
+                         + new["avg_latency_ms"] * new["requests"]) / total, 1
+                    )
+                for key in ("requests", "successes", "errors", "retries", "rejected"):
+                    new[key] += old.get(key, 0)
+                new["error_rate"] = round(new["errors"] / new["requests"], 3) if new["requests"] else 0.0
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+# -----------------------------------------
+# Shared Scheduler
+# -----------------------------------------
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+def get_scheduler():
+    """Process-wide scheduler so rate limits and circuit state carry across calls."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = FetchScheduler()
+        return _default_scheduler
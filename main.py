@@ -1,26 +1,73 @@
 # main.py
 import os
+import sys
 import datetime
-from scraper import scrape_articles
+from scraper import scrape_articles, refetch_failed
 from summarizer import summarize_articles
 from analyzer import extract_keywords
 from visualizer import plot_keywords
 from reporter import save_report
+from fetcher import get_scheduler
+from checkpoint import (
+    start_run, find_resumable_run, load_stage, save_stage, invalidate_after, mark_complete
+)
 
-# === Create a timestamped data folder ===
-timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-data_dir = f"data/run_{timestamp}"
-os.makedirs(data_dir, exist_ok=True)
+DEFAULT_TOPIC = "artificial intelligence"
 
-def run_dashboard():
-    print("Scraping articles...")
-    articles = scrape_articles()
+def prepare_run_dir(topic):
+    """Resume the newest unfinished run for this topic, or start a new timestamped one."""
+    run_dir = find_resumable_run(topic)
+    if run_dir:
+        print(f"♻️ Resuming unfinished run: {run_dir}")
+        return run_dir
 
-    print("Summarizing articles...")
-    articles = summarize_articles(articles)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    run_dir = f"data/run_{timestamp}"
+    start_run(run_dir, topic)
+    return run_dir
 
-    print("Analyzing keywords...")
-    keywords = extract_keywords(articles)
+def run_dashboard(topic=DEFAULT_TOPIC):
+    # === Create (or resume) a timestamped data folder ===
+    data_dir = prepare_run_dir(topic)
+
+    articles = load_stage(data_dir, "scrape")
+    if articles is None:
+        print("Scraping articles...")
+        articles = scrape_articles(topic)
+        if not articles:
+            # Leave the stage unfinished so the next attempt fetches the feed again
+            print("⚠ No articles found; stopping without a scrape checkpoint.")
+            return
+        invalidate_after(data_dir, "scrape")
+        save_stage(data_dir, "scrape", articles)
+    else:
+        print("Scraping skipped (checkpoint found), retrying failed URLs...")
+        if refetch_failed(articles):
+            # Drop downstream checkpoints first so a crash can't leave them on top of new data
+            invalidate_after(data_dir, "scrape")
+            save_stage(data_dir, "scrape", articles)
+
+    scheduler = get_scheduler()
+    if scheduler.stats():
+        # Merge so a resumed run adds to, rather than replaces, the first attempt's stats
+        scheduler.export_stats(os.path.join(data_dir, "fetch_stats.json"), merge=True)
+
+    summaries = load_stage(data_dir, "summarize")
+    if summaries is None:
+        print("Summarizing articles...")
+        summaries = summarize_articles(articles)
+        save_stage(data_dir, "summarize", summaries)
+    else:
+        print("Summarizing skipped (checkpoint found).")
+
+    keywords = load_stage(data_dir, "keywords")
+    if keywords is None:
+        print("Analyzing keywords...")
+        keywords = extract_keywords(summaries)
+        save_stage(data_dir, "keywords", keywords)
+    else:
+        print("Keyword analysis skipped (checkpoint found).")
+        keywords = [tuple(k) for k in keywords]
 
     print("\nTop keywords found:")
     for word, freq in keywords:
@@ -30,10 +77,11 @@ def run_dashboard():
     plot_keywords(keywords, output_dir=data_dir)
 
     print("Saving reports...")
-    save_report(articles, keywords, output_dir=data_dir)
+    save_report(summaries, keywords, output_dir=data_dir)
+    mark_complete(data_dir)
 
     print("\n✅ Dynamic Knowledge Dashboard run complete!")
     print(f"📁 All files saved in: {data_dir}")
 
 if __name__ == "__main__":
-    run_dashboard()
+    run_dashboard(" ".join(sys.argv[1:]) or DEFAULT_TOPIC)
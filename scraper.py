@@ -1,12 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from bs4 import BeautifulSoup
 import feedparser
 
-def scrape_articles(topic, limit=10):
+from fetcher import FetchError, get_scheduler
+
+MAX_WORKERS = 8
+# Per-article budgets: raw HTML downloaded and paragraph text kept in "content"
+MAX_PAGE_BYTES = 2_000_000
+MAX_CONTENT_BYTES = 200_000
+
+def _join_paragraphs(paragraphs, max_bytes):
+    """Join paragraph text, stopping once the byte budget is used up."""
+    kept, remaining = [], max_bytes
+    for text in paragraphs:
+        encoded = text.encode("utf-8")
+        if len(encoded) >= remaining:
+            kept.append(encoded[:remaining].decode("utf-8", errors="ignore"))
+            break
+        kept.append(text)
+        remaining -= len(encoded) + 1
+    return " ".join(kept)
+
+def fetch_content(url, fallback="", scheduler=None,
+                  max_page_bytes=MAX_PAGE_BYTES, max_content_bytes=MAX_CONTENT_BYTES):
+    """
+    Download a page and join its paragraph text.
+    Returns (content, fetched) — on failure the fallback text is used and fetched is False.
+    Huge pages (live blogs, transcripts) are cut off at the page and content byte budgets.
+    """
+    scheduler = scheduler or get_scheduler()
+    try:
+        response = scheduler.fetch(url, max_bytes=max_page_bytes)
+    except (FetchError, requests.RequestException) as e:
+        print(f"⚠ Could not fetch {url}: {e}")
+        return fallback or "", False
+
+    # One unparseable page must not abort the whole scrape
+    try:
+        soup = BeautifulSoup(response.text, "html.parser")
+        paragraphs = (p.get_text() for p in soup.find_all("p"))
+        return _join_paragraphs(paragraphs, max_content_bytes), True
+    except Exception as e:
+        print(f"⚠ Could not parse {url}: {e}")
+        return fallback or "", False
+
+def scrape_articles(topic, limit=10, scheduler=None):
     """
     Fetch recent articles related to a topic using Google News RSS.
     Returns a list of articles with: title, url, summary, content, published, source
+    Page downloads go through the shared FetchScheduler, which rate-limits and retries per host.
     """
+    scheduler = scheduler or get_scheduler()
     
     query = topic.replace(" ", "+")
     
@@ -17,28 +62,33 @@ def scrape_articles(topic, limit=10):
     )
 
     articles = []
-    feed = feedparser.parse(feed_url)
+    try:
+        # The feed gets its own breaker so slow article links can't lock everyone out of it
+        feed = feedparser.parse(scheduler.fetch(feed_url, group="feed").content)
+    except (FetchError, requests.RequestException) as e:
+        print(f"⚠ Could not fetch news feed: {e}")
+        return []
 
     if not feed.entries:
         print("⚠ No entries returned from Google. Topic:", topic)
         return []
 
-    for entry in feed.entries[:limit]:
+    entries = feed.entries[:limit]
+
+    # Fetch full article content concurrently; the scheduler throttles each host
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = pool.map(
+            lambda e: fetch_content(e.link, fallback=e.get("summary", ""), scheduler=scheduler),
+            entries
+        )
+
+    for entry, (content, fetched) in zip(entries, results):
         title = entry.title
         url = entry.link
         summary = entry.get("summary", "")
         published = entry.get("published", "")
         source = entry.get("source", {}).get("title", "")
 
-        # Fetch full article content
-        try:
-            response = requests.get(url, timeout=5)
-            soup = BeautifulSoup(response.text, "html.parser")
-            paragraphs = [p.get_text() for p in soup.find_all("p")]
-            content = " ".join(paragraphs)
-        except:
-            content = summary or ""
-
         articles.append({
             "title": title,
             "url": url,
@@ -46,8 +96,28 @@ def scrape_articles(topic, limit=10):
             "content": content,
             "published": published,
             "source": source,
+            "fetched": fetched,
             "image": None  # reserved for the next upgrade
         })
 
     print(f"✅ Found {len(articles)} articles.")
     return articles
+
+def refetch_failed(articles, scheduler=None):
+    """
+    Retry only the articles whose content fetch failed on a previous attempt.
+    Returns the number of articles that were recovered.
+    """
+    scheduler = scheduler or get_scheduler()
+    recovered = 0
+    for article in articles:
+        if article.get("fetched", True):
+            continue
+        content, fetched = fetch_content(article.get("url", ""), fallback=article.get("summary", ""), scheduler=scheduler)
+        if fetched:
+            article["content"] = content
+            article["fetched"] = True
+            recovered += 1
+
+    print(f"✅ Recovered {recovered} previously failed articles.")
+    return recovered
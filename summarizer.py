@@ -5,8 +5,21 @@ from nltk.tokenize import sent_tokenize, word_tokenize
 from textblob import TextBlob
 import re
 import heapq
+import itertools
+from collections import Counter
 import streamlit as st
 
+# Content larger than this is summarized in windows instead of all at once
+STREAMING_THRESHOLD = 20_000
+# Per-article budgets for the streaming summarizer
+MAX_ARTICLE_BYTES = 200_000
+MAX_ARTICLE_TOKENS = 40_000
+WINDOW_CHARS = 8_192
+# Bounds on what the streaming summarizer keeps in memory
+MAX_VOCABULARY = 5_000
+MAX_SENTENCE_TOKENS = 200
+CANDIDATES_PER_SENTENCE = 5
+
 # -----------------------------------------
 # Ensure NLTK resources at runtime
 # -----------------------------------------
@@ -67,15 +80,117 @@ def summarize_text(text, max_sentences=3):
     summary_sents = heapq.nlargest(max_sentences, scores, key=scores.get)
     return " ".join(summary_sents)
 
+# -----------------------------------------
+# Streaming Summarization (large articles)
+# -----------------------------------------
+def _iter_windows(content, window_chars):
+    """Yield the content in windows, whether it is a string or an iterable of chunks."""
+    if isinstance(content, str):
+        for start in range(0, len(content), window_chars):
+            yield content[start:start + window_chars]
+    else:
+        yield from content
+
+def _iter_sentences(content, window_chars):
+    """
+    Yield cleaned sentences window by window. The trailing, possibly unfinished
+    sentence of each window is carried into the next; an over-long carry is
+    flushed as-is so memory stays bounded by the window size.
+    """
+    carry = ""
+    for window in _iter_windows(content, window_chars):
+        buffer = carry + window
+        sentences = sent_tokenize(buffer)
+        if not sentences:
+            carry = ""
+            continue
+        last = sentences.pop()
+        start = buffer.rfind(last)
+        carry = buffer[start:] if start != -1 else last
+        for sent in sentences:
+            sent = clean_text(sent)
+            if sent:
+                yield sent
+        if len(carry) > window_chars:
+            yield clean_text(carry)
+            carry = ""
+    carry = clean_text(carry)
+    if carry:
+        yield carry
+
+def _sentence_score(counts, freq, max_freq):
+    return sum(freq[w] * n for w, n in counts.items()) / max_freq
+
+def summarize_text_streaming(content, max_sentences=3, max_bytes=MAX_ARTICLE_BYTES,
+                             max_tokens=MAX_ARTICLE_TOKENS, window_chars=WINDOW_CHARS):
+    """
+    Frequency-based summary with bounded memory.
+    Reads at most `max_bytes` / `max_tokens` of content in windows, keeping only running
+    word frequencies and a small heap of candidate sentences. Whenever the heap is full,
+    candidates are re-scored against the current frequencies before the weakest is
+    evicted, so early sentences aren't crowded out just because counts grow over time.
+    """
+    stop_words = set(stopwords.words("english"))
+    freq = Counter()
+    max_freq = 0
+    candidates = []  # min-heap of [score, order, sentence, sentence word counts]
+    pool_size = max_sentences * CANDIDATES_PER_SENTENCE
+    bytes_read = tokens_read = 0
+    order = itertools.count()
+    fallback = ""
+
+    for sent in _iter_sentences(content, window_chars):
+        if not fallback:
+            fallback = " ".join(sent.split()[:MAX_SENTENCE_TOKENS])
+        bytes_read += len(sent.encode("utf-8"))
+        words = word_tokenize(sent.lower())
+        tokens_read += len(words)
+        if bytes_read > max_bytes or tokens_read > max_tokens:
+            break
+
+        counts = Counter(w for w in words if w.isalpha() and w not in stop_words)
+        freq.update(counts)
+        if counts:
+            max_freq = max(max_freq, max(freq[w] for w in counts))
+        if len(freq) > MAX_VOCABULARY:
+            freq = Counter(dict(freq.most_common(MAX_VOCABULARY // 2)))
+
+        if not counts or len(words) > MAX_SENTENCE_TOKENS:
+            continue
+        entry = [_sentence_score(counts, freq, max_freq), next(order), sent, counts]
+        if len(candidates) < pool_size:
+            heapq.heappush(candidates, entry)
+            continue
+
+        # Compare everyone on today's frequencies, not the ones at insert time
+        for candidate in candidates:
+            candidate[0] = _sentence_score(candidate[3], freq, max_freq)
+        heapq.heapify(candidates)
+        if entry[0] > candidates[0][0]:
+            heapq.heapreplace(candidates, entry)
+
+    if not freq or not candidates:
+        return fallback
+
+    scores = {}
+    for _, _, sent, counts in candidates:
+        scores[sent] = _sentence_score(counts, freq, max_freq)
+
+    summary_sents = heapq.nlargest(max_sentences, scores, key=scores.get)
+    return " ".join(summary_sents)
+
 # -----------------------------------------
 # Summarize Articles with Sentiment
 # -----------------------------------------
-def summarize_articles(articles):
+def summarize_articles(articles, max_bytes=MAX_ARTICLE_BYTES, max_tokens=MAX_ARTICLE_TOKENS):
     summarized = []
 
     for article in articles:
         raw_content = article.get("content") or article.get("summary") or ""
-        summary = summarize_text(raw_content)
+        if len(raw_content) > STREAMING_THRESHOLD:
+            summary = summarize_text_streaming(raw_content, max_bytes=max_bytes, max_tokens=max_tokens)
+        else:
+            summary = summarize_text(raw_content)
         clean_summary = clean_text(summary)
 
         if clean_summary:
@@ -1,21 +1,42 @@
 import os
+import threading
 import streamlit as st
-from supabase import create_client
+from supabase import create_client, ClientOptions
+
+_client = None
+_client_lock = threading.Lock()
 
 def init_connection():
-    """Initialize Supabase client using either Streamlit secrets or local .env"""
-    try:
-        SUPABASE_URL = st.secrets.get("SUPABASE_URL", os.getenv("SUPABASE_URL"))
-        SUPABASE_KEY = st.secrets.get("SUPABASE_KEY", os.getenv("SUPABASE_KEY"))
+    """
+    Return the process-wide Supabase client, creating it on first use.
+    Credentials come from either Streamlit secrets or local .env.
+    The client is shared by every user, so it must not hold on to or auto-refresh
+    anyone's session; each user's tokens live in their own st.session_state.
+    """
+    global _client
+    if _client is not None:
+        return _client
 
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            st.error("❌ Supabase credentials missing. Set them in .env locally or Streamlit Secrets in deployed app.")
-            return None
+    with _client_lock:
+        if _client is not None:
+            return _client
+        try:
+            SUPABASE_URL = st.secrets.get("SUPABASE_URL", os.getenv("SUPABASE_URL"))
+            SUPABASE_KEY = st.secrets.get("SUPABASE_KEY", os.getenv("SUPABASE_KEY"))
 
-        print(f"✅ Using Supabase URL: {SUPABASE_URL}")
-        client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        return client
+            # Callers report the failure to the user; just log it here
+            if not SUPABASE_URL or not SUPABASE_KEY:
+                print("⚠ Supabase credentials missing.")
+                return None
 
-    except Exception as e:
-        st.error(f"Error initializing Supabase: {e}")
-        return None
+            print(f"✅ Using Supabase URL: {SUPABASE_URL}")
+            _client = create_client(
+                SUPABASE_URL,
+                SUPABASE_KEY,
+                options=ClientOptions(auto_refresh_token=False, persist_session=False),
+            )
+            return _client
+
+        except Exception as e:
+            print(f"⚠ Error initializing Supabase: {e}")
+            return None
@@ -0,0 +1,39 @@
+import itertools
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from summarizer import summarize_text, summarize_text_streaming
+
+TOPIC = ["market", "stocks", "inflation", "rates", "growth"]
+BEST = (3, 7, 11)
+
+def _article_with_early_highlights(n_sentences=600):
+    """Long article whose three strongest sentences all sit near the start."""
+    rng = random.Random(0)
+    filler_words = ["".join(p) for p in itertools.product("bcdfghjklm", "aeiou", "prstv", "aeiou")]
+    sentences = []
+    for i in range(n_sentences):
+        if i in BEST:
+            sentences.append(f"Highlight {'abc'[BEST.index(i)]} says " + " ".join(TOPIC * 3) + ".")
+        else:
+            words = rng.sample(filler_words, 8) + [TOPIC[i % len(TOPIC)]]
+            sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences), [sentences[i] for i in BEST]
+
+def test_streaming_keeps_early_best_sentences():
+    text, best = _article_with_early_highlights()
+
+    summary = summarize_text_streaming(text, max_sentences=3)
+
+    for sentence in best:
+        assert sentence in summary
+
+def test_streaming_agrees_with_full_summary_on_top_sentence():
+    text, _ = _article_with_early_highlights()
+
+    top_full = summarize_text(text, max_sentences=1)
+
+    assert top_full in summarize_text_streaming(text, max_sentences=3)